@@ -1,7 +1,7 @@
 import tkinter as tk
 
-def show_splash():
-    splash = tk.Tk()
+def show_splash(root):
+    splash = tk.Toplevel(root)
     splash.overrideredirect(True)
     splash.configure(bg="#121212")
     splash.geometry("400x200+500+300")
@@ -12,5 +12,8 @@ def show_splash():
         font=("Segoe UI", 16, "bold")
     ).pack(expand=True)
 
-    splash.after(2000, splash.destroy)
-    splash.mainloop()
+    def close():
+        splash.destroy()
+        root.deiconify()
+
+    splash.after(2000, close)
@@ -11,14 +11,12 @@ Features:
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-import time
+import functools
+import math
 import queue
 import threading
-from collections import deque
 from datetime import timedelta
 
-import matplotlib
-matplotlib.use("Agg")
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
@@ -29,8 +27,10 @@ import lameenc
 
 
 # ---------------- SPLASH ----------------
-def show_splash():
-    splash = tk.Tk()
+def show_splash(root):
+    # Toplevel on the app's own interpreter instead of a second Tk with
+    # its own mainloop; the caller builds its UI while this is showing.
+    splash = tk.Toplevel(root)
     splash.overrideredirect(True)
     splash.configure(bg="#121212")
 
@@ -47,8 +47,11 @@ def show_splash():
         font=("Segoe UI", 16, "bold")
     ).pack(expand=True)
 
-    splash.after(2000, splash.destroy)
-    splash.mainloop()
+    def close():
+        splash.destroy()
+        root.deiconify()
+
+    splash.after(2000, close)
 
 
 # ---------------- CONFIG ----------------
@@ -57,14 +60,102 @@ CHANNELS = 1
 CHUNK_SIZE = 1024
 WAVE_SECONDS = 3
 MAX_SAMPLES = SAMPLE_RATE * WAVE_SECONDS
+SLOTS = 256           # callback ring, ~5 s of blocks at 48 kHz
+FAST_TICK_MS = 50     # level meter + timer
+SLOW_TICK_MS = 150    # waveform redraw
+
+
+# ---------------- DSP ----------------
+def _ingest(chunk, ring, pos, level):
+    # One pass over the new samples: write them into the waveform ring
+    # and accumulate the sum of squares for the level meter EMA. The ring
+    # is stored twice back to back so any window of it is a plain slice.
+    n = chunk.shape[0]
+    size = ring.shape[0] // 2
+    s = 0.0
+    for i in range(n):
+        v = chunk[i]
+        j = (pos + i) % size
+        ring[j] = v
+        ring[j + size] = v
+        s += v * v
+    rms = math.sqrt(s / n)
+    return (pos + n) % size, 0.8 * level + 0.2 * rms
+
+
+# Plain Python until _warm_up swaps in the numba build, if available.
+ingest = _ingest
+
+
+def _warm_up():
+    # Runs on a daemon thread during the splash: device enumeration, then
+    # the numba import and compile (or cache load) of the ingest kernel,
+    # all off the main thread.
+    global ingest
+    _cached_devices()
+    try:
+        from numba import njit
+    except ImportError:  # optional; the pure Python kernel is used
+        return
+
+    kernel = njit(cache=True, fastmath=True)(_ingest)
+    kernel(
+        np.zeros(CHUNK_SIZE, dtype=np.float32),
+        np.zeros(2 * CHUNK_SIZE, dtype=np.float32), 0, 0.0
+    )
+    ingest = kernel
 
 
 # ---------------- AUDIO ----------------
+@functools.lru_cache(maxsize=1)
+def _cached_devices():
+    return sd.query_devices()
+
+
+def list_mics():
+    return [
+        (i, d["name"]) for i, d in enumerate(_cached_devices())
+        if d["max_input_channels"] > 0
+    ]
+
+
+def refresh_mics():
+    # PortAudio only scans devices in Pa_Initialize, so re-initialise it
+    # to pick up hot-plugged mics. Callers must have no stream open.
+    sd._terminate()
+    sd._initialize()
+    _cached_devices.cache_clear()
+    return list_mics()
+
+
+def to_pcm16(data):
+    # float32 multiply/clip in place, then one saturated cast to int16;
+    # no float64 temporaries and no wrap-around on clipped input.
+    scratch = np.multiply(data, 32767.0, dtype=np.float32)
+    np.clip(scratch, -32768, 32767, out=scratch)
+    pcm = np.empty(data.shape, dtype=np.int16)
+    pcm[...] = scratch
+    return pcm
+
+
 class Recorder:
     def __init__(self):
         self.stream = None
         self.q = queue.Queue()
-        self.frames = []
+        # Captured audio lives in one contiguous buffer that grows by
+        # doubling, so saving is a slice rather than a concatenate.
+        self._buf = np.empty((SAMPLE_RATE * 60, CHANNELS), dtype=np.float32)
+        self._len = 0
+        # The callback copies into preallocated slots and only queues the
+        # slot index, so no audio buffer is allocated per block (the queue
+        # put still makes a small tuple and takes the queue's lock).
+        # _wi/_ri are the write/read counters; when the consumer falls a
+        # full ring behind, new blocks are dropped and counted rather than
+        # overwriting slots that have not been collected yet.
+        self._slots = np.empty((SLOTS, CHUNK_SIZE, CHANNELS), dtype=np.float32)
+        self._wi = 0
+        self._ri = 0
+        self.dropped = 0
         self.recording = False
         self.paused = False
         self.lock = threading.Lock()
@@ -75,21 +166,41 @@ class Recorder:
         with self.lock:
             if not self.recording or self.paused:
                 return
-        self.q.put(indata.copy())
-
-    def start(self):
-        with self.lock:
-            self.frames.clear()
-            self.recording = True
-            self.paused = False
-
-        self.stream = sd.InputStream(
+        if self._wi - self._ri >= SLOTS:
+            self.dropped += 1
+            return
+        np.copyto(self._slots[self._wi % SLOTS, :frames], indata)
+        self.q.put((self._wi, frames))
+        self._wi += 1
+
+    def start(self, device=None):
+        # Open the stream before touching any state, so a bad device leaves
+        # the previous recording and recording=False intact.
+        stream = sd.InputStream(
             samplerate=SAMPLE_RATE,
             channels=CHANNELS,
             blocksize=CHUNK_SIZE,
+            device=device,
             callback=self._callback,
         )
-        self.stream.start()
+
+        with self.lock:
+            self._len = 0
+            self._wi = 0
+            self._ri = 0
+            self.dropped = 0
+            self.recording = True
+            self.paused = False
+
+        self.stream = stream
+        try:
+            stream.start()
+        except Exception:
+            with self.lock:
+                self.recording = False
+            stream.close()
+            self.stream = None
+            raise
 
     def stop(self):
         with self.lock:
@@ -101,8 +212,7 @@ class Recorder:
             self.stream.close()
             self.stream = None
 
-        while not self.q.empty():
-            self.frames.append(self.q.get())
+        self.collect()
 
     def pause(self):
         self.paused = True
@@ -110,14 +220,38 @@ class Recorder:
     def resume(self):
         self.paused = False
 
+    def _drain(self):
+        # Take the queue mutex once and empty it in bulk instead of paying
+        # a lock round-trip per block with get_nowait().
+        with self.q.mutex:
+            batch = list(self.q.queue)
+            self.q.queue.clear()
+            self.q.unfinished_tasks = 0
+        return batch
+
+    def _append(self, block):
+        need = self._len + len(block)
+        if need > len(self._buf):
+            grown = np.empty(
+                (max(need, 2 * len(self._buf)), CHANNELS), dtype=np.float32
+            )
+            grown[:self._len] = self._buf[:self._len]
+            self._buf = grown
+        self._buf[self._len:need] = block
+        self._len = need
+
     def collect(self):
-        while not self.q.empty():
-            self.frames.append(self.q.get())
+        start = self._len
+        for idx, frames in self._drain():
+            self._append(self._slots[idx % SLOTS, :frames])
+            self._ri = idx + 1
+        return self._buf[start:self._len]
+
+    def elapsed(self):
+        return self._len // SAMPLE_RATE
 
     def audio(self):
-        if not self.frames:
-            return np.empty((0, CHANNELS), dtype=np.float32)
-        return np.concatenate(self.frames, axis=0)
+        return self._buf[:self._len]
 
     def save_wav(self, path):
         data = self.audio()
@@ -130,16 +264,19 @@ class Recorder:
         if data.size == 0:
             raise RuntimeError("No audio recorded")
 
-        pcm = (data * 32767).astype(np.int16).tobytes()
         enc = lameenc.Encoder()
         enc.set_bit_rate(128)
         enc.set_in_sample_rate(SAMPLE_RATE)
         enc.set_channels(CHANNELS)
         enc.set_quality(2)
 
-        mp3 = enc.encode(pcm) + enc.flush()
+        # Convert and encode ~10 s at a time straight into the file, so
+        # neither the full int16 copy nor the full MP3 is held in memory.
+        step = SAMPLE_RATE * 10
         with open(path, "wb") as f:
-            f.write(mp3)
+            for i in range(0, len(data), step):
+                f.write(enc.encode(to_pcm16(data[i:i + step]).tobytes()))
+            f.write(enc.flush())
 
 
 # ---------------- UI ----------------
@@ -151,15 +288,33 @@ class VoiceRecorderApp(tk.Tk):
         self.configure(bg="#0f0f0f")
         self.resizable(False, False)
 
+        # Put the splash on screen first, then build the rest of the window
+        # (and enumerate devices in the background) while it is visible.
+        self.withdraw()
+        show_splash(self)
+        self.update()
+        # Device enumeration can take hundreds of ms (MME on Windows).
+        threading.Thread(target=_warm_up, daemon=True).start()
+
         self.rec = Recorder()
-        self.wave = deque(maxlen=MAX_SAMPLES)
-        self.start_time = None
+        # Mirrored ring (see ingest): the current window is always the
+        # contiguous slice [pos, pos + MAX_SAMPLES).
+        self._ring = np.zeros(2 * MAX_SAMPLES, dtype=np.float32)
+        self._ring_pos = 0
+        self._wave_dirty = False
         self.level = 0.0
+        self._last_seconds = None
+        self._last_dropped = 0
+        self._saving = None
+        self._mp3_error = None
 
         self._build_layout()
         self._build_waveform()
 
-        self.after(50, self.update_ui)
+        self.bind("<<Mp3Done>>", self._on_mp3_done)
+
+        self.after(FAST_TICK_MS, self._tick_fast)
+        self.after(SLOW_TICK_MS, self._tick_slow)
 
     # ---------- LAYOUT ----------
     def _build_layout(self):
@@ -199,6 +354,12 @@ class VoiceRecorderApp(tk.Tk):
         )
         self.timer.pack()
 
+        self.overrun = tk.Label(
+            self.controls, text="",
+            fg="#ea4335", bg="#181818"
+        )
+        self.overrun.pack()
+
         style = ttk.Style(self)
         style.theme_use("clam")
         style.configure(
@@ -213,6 +374,24 @@ class VoiceRecorderApp(tk.Tk):
         )
         self.level_bar.pack(pady=8)
 
+        mic_row = tk.Frame(self.controls, bg="#181818")
+        mic_row.pack(pady=4)
+
+        # Filled on first open from the cached device list, so building
+        # the window never waits on PortAudio enumeration.
+        self._mics = {"Default": None}
+        self.mic_var = tk.StringVar(value="Default")
+        self.mic_box = ttk.Combobox(
+            mic_row, textvariable=self.mic_var, values=["Default"],
+            state="readonly", width=16, postcommand=self._fill_mics
+        )
+        self.mic_box.pack(side="left")
+
+        tk.Button(
+            mic_row, text="⟳", command=self.reload_mics,
+            bg="#2b2b2b", fg="white", bd=0
+        ).pack(side="left", padx=(4, 0))
+
     def _btn(self, text, cmd, color, disabled=False):
         return tk.Button(
             self.controls, text=text, command=cmd,
@@ -220,6 +399,22 @@ class VoiceRecorderApp(tk.Tk):
             state="disabled" if disabled else "normal"
         )
 
+    def _fill_mics(self, mics=None):
+        self._mics = {"Default": None}
+        for i, name in mics if mics is not None else list_mics():
+            self._mics[f"{i}: {name}"] = i
+        self.mic_box["values"] = list(self._mics)
+        if self.mic_var.get() not in self._mics:
+            self.mic_var.set("Default")
+
+    def reload_mics(self):
+        if self.rec.stream is not None:
+            messagebox.showwarning(
+                "Microphones", "Stop recording before refreshing devices"
+            )
+            return
+        self._fill_mics(refresh_mics())
+
     # ---------- WAVEFORM ----------
     def _build_waveform(self):
         card = tk.Frame(self, bg="#161616")
@@ -231,19 +426,73 @@ class VoiceRecorderApp(tk.Tk):
         self.ax.set_ylim(-1, 1)
         self.ax.axis("off")
 
-        self.line, = self.ax.plot([], [], color="#00e676")
+        self.ax.set_xlim(0, MAX_SAMPLES)
+
+        self.line, = self.ax.plot([], [], color="#00e676", animated=True)
         self.canvas = FigureCanvasTkAgg(self.fig, master=card)
         self.canvas.get_tk_widget().pack(expand=True, fill="both")
 
+        # Blitting: cache the static background after every full draw
+        # (first show, resize) and only repaint the line on top of it.
+        self._bg = None
+        self._env_step = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
+
+    def _window(self):
+        return self._ring[self._ring_pos:self._ring_pos + MAX_SAMPLES]
+
+    def _envelope(self, y):
+        # Agg strokes every vertex, so reduce the window to a min/max pair
+        # per pixel column before handing it to the line. The window is
+        # always MAX_SAMPLES long, so the x grid only changes with the
+        # canvas width and is set once per width.
+        # Size to the axes (what the line is drawn into), not the canvas
+        # widget; before the first draw the bbox is degenerate.
+        cols = int(self.ax.bbox.width)
+        if cols <= 1:
+            cols = 580
+        step = max(1, len(y) // cols)
+        n = len(y) // step
+
+        if step != self._env_step:
+            self._env_step = step
+            if step == 1:
+                self.line.set_xdata(np.arange(len(y)))
+            else:
+                self.line.set_xdata(np.repeat(np.arange(n) * step, 2))
+
+        if step == 1:
+            return y
+
+        blocks = y[: n * step].reshape(n, step)
+        env = np.empty(n * 2, dtype=y.dtype)
+        env[0::2] = blocks.min(axis=1)
+        env[1::2] = blocks.max(axis=1)
+        return env
+
+    def _blit_wave(self):
+        if self._bg is None:
+            # No cached background yet: let the idle draw produce one
+            # (its draw_event also paints the line) rather than blocking.
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._bg)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+
     # ---------- CONTROLS ----------
     def start(self):
         try:
-            self.rec.start()
+            self.rec.start(self._mics.get(self.mic_var.get()))
         except Exception as e:
             messagebox.showerror("Mic Error", str(e))
             return
 
-        self.start_time = time.time()
         self.status.config(text="● Recording", fg="#1db954")
         self.btn_start.config(state="disabled")
         self.btn_pause.config(state="normal")
@@ -263,9 +512,9 @@ class VoiceRecorderApp(tk.Tk):
 
     def stop(self):
         self.rec.stop()
-        self.start_time = None
         self.status.config(text="● Stopped", fg="#ea4335")
-        self.btn_start.config(state="normal")
+        if self._saving is None:
+            self.btn_start.config(state="normal")
         self.btn_pause.config(state="disabled")
         self.btn_resume.config(state="disabled")
         self.btn_stop.config(state="disabled")
@@ -278,36 +527,101 @@ class VoiceRecorderApp(tk.Tk):
 
     def save_mp3(self):
         path = filedialog.asksaveasfilename(defaultextension=".mp3")
-        if path:
+        if not path:
+            return
+
+        # LAME runs on a worker so the event loop (and the meters, if
+        # still recording) keep going; completion comes back as an event.
+        self._saving = tk.Toplevel(self, bg="#181818")
+        self._saving.title("Saving")
+        self._saving.transient(self)
+        self._saving.resizable(False, False)
+        # The worker encodes a live view of the recording buffer, so the
+        # dialog can't be dismissed and nothing that could restart or
+        # rewrite the recording is clickable until <<Mp3Done>>.
+        self._saving.protocol("WM_DELETE_WINDOW", lambda: None)
+        tk.Label(
+            self._saving, text="Saving MP3…",
+            fg="white", bg="#181818", padx=24, pady=16
+        ).pack()
+        for b in (self.btn_start, self.btn_wav, self.btn_mp3):
+            b.config(state="disabled")
+
+        # A grab on an unmapped window fails ("window not viewable").
+        try:
+            self._saving.wait_visibility()
+            self._saving.grab_set()
+        except tk.TclError as e:
+            self._close_saving()
+            messagebox.showerror("Save Error", str(e))
+            return
+
+        self._mp3_error = None
+        threading.Thread(
+            target=self._encode_mp3, args=(path,), daemon=True
+        ).start()
+
+    def _encode_mp3(self, path):
+        try:
             self.rec.save_mp3(path)
-            messagebox.showinfo("Saved", "MP3 file saved")
+        except Exception as e:
+            self._mp3_error = e
+        self.event_generate("<<Mp3Done>>", when="tail")
+
+    def _close_saving(self):
+        self._saving.destroy()
+        self._saving = None
+        self.btn_start.config(
+            state="disabled" if self.rec.recording else "normal"
+        )
+        self.btn_wav.config(state="normal")
+        self.btn_mp3.config(state="normal")
 
-    # ---------- UPDATE ----------
-    def update_ui(self):
-        self.rec.collect()
+    def _on_mp3_done(self, event):
+        self._close_saving()
 
-        if self.rec.frames:
-            data = self.rec.frames[-1].flatten()
-            self.wave.extend(data.tolist())
+        if self._mp3_error:
+            messagebox.showerror("Save Error", str(self._mp3_error))
+        else:
+            messagebox.showinfo("Saved", "MP3 file saved")
 
-            rms = np.sqrt(np.mean(data ** 2))
-            self.level = self.level * 0.8 + rms * 0.2
+    # ---------- UPDATE ----------
+    def _tick_fast(self):
+        new = self.rec.collect()
+        if len(new):
+            self._ring_pos, self.level = ingest(
+                new.reshape(-1), self._ring, self._ring_pos, self.level
+            )
+            self._wave_dirty = True
             self.level_bar["value"] = self.level
 
-            y = np.array(self.wave)
-            self.line.set_data(range(len(y)), y)
-            self.ax.set_xlim(0, len(y))
-            self.canvas.draw_idle()
-
-        if self.rec.recording and self.start_time:
-            self.timer.config(
-                text=str(timedelta(seconds=int(time.time() - self.start_time)))
+        # Elapsed time follows the audio clock (samples captured), so
+        # pauses are excluded; the label only changes once per second.
+        seconds = self.rec.elapsed()
+        if seconds != self._last_seconds:
+            self._last_seconds = seconds
+            self.timer.config(text=str(timedelta(seconds=seconds)))
+
+        if self.rec.dropped != self._last_dropped:
+            self._last_dropped = self.rec.dropped
+            self.overrun.config(
+                text=f"⚠ {self._last_dropped} blocks dropped"
+                if self._last_dropped else ""
             )
 
-        self.after(50, self.update_ui)
+        self.after(FAST_TICK_MS, self._tick_fast)
+
+    def _tick_slow(self):
+        # Nothing new (idle, paused, stopped): skip the envelope and blit.
+        # Full redraws on resize repaint the line from draw_event anyway.
+        if self._wave_dirty:
+            self._wave_dirty = False
+            self.line.set_ydata(self._envelope(self._window()))
+            self._blit_wave()
+
+        self.after(SLOW_TICK_MS, self._tick_slow)
 
 
 # ---------------- RUN ----------------
 if __name__ == "__main__":
-    show_splash()
     VoiceRecorderApp().mainloop()